@@ -2,13 +2,29 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .scanner import DuplicateScanner
-from .remover import InteractiveRemover
-from .utils import format_size, get_file_hash
-
 __all__ = [
     "DuplicateScanner",
     "InteractiveRemover",
     "format_size",
     "get_file_hash"
-]
\ No newline at end of file
+]
+
+# Public names are loaded lazily (PEP 562) so that importing doppel
+# does not pay for hashlib/sqlite3 setup until something needs them.
+_LAZY_IMPORTS = {
+    "DuplicateScanner": "scanner",
+    "InteractiveRemover": "remover",
+    "format_size": "utils",
+    "get_file_hash": "utils",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
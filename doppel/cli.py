@@ -6,14 +6,23 @@ Command-line interface for doppel
 import sys
 import argparse
 from pathlib import Path
+from typing import Optional
 from . import __version__
 from .scanner import DuplicateScanner
 from .remover import InteractiveRemover
 from .utils import confirm_action
 
+# Parser singleton: argparse construction is surprisingly expensive and
+# parse state is per-parse_args call, so one instance serves all calls
+_PARSER: Optional[argparse.ArgumentParser] = None
+
 
 def create_parser() -> argparse.ArgumentParser:
-    """Create and configure argument parser."""
+    """Create and configure argument parser (cached after first call)."""
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+
     parser = argparse.ArgumentParser(
         prog="doppel",
         description="Find and eliminate duplicate filenames in a directory tree",
@@ -50,6 +59,28 @@ def create_parser() -> argparse.ArgumentParser:
         help="Automatically keep newest file from each duplicate set (no prompts)"
     )
 
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Hash only the head and tail of large files (faster, "
+             "probabilistic content comparison)"
+    )
+
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of hash worker threads (default: min(8, cpu count))"
+    )
+
+    parser.add_argument(
+        "--parallel-walk",
+        action="store_true",
+        help="Read directories concurrently (useful on networked "
+             "filesystems)"
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -62,6 +93,7 @@ def create_parser() -> argparse.ArgumentParser:
         help="Show detailed progress information"
     )
 
+    _PARSER = parser
     return parser
 
 
@@ -109,7 +141,13 @@ def main():
         sys.exit(1)
 
     # Create scanner
-    scanner = DuplicateScanner(root_path, compare_content=args.content)
+    scanner = DuplicateScanner(
+        root_path,
+        compare_content=args.content,
+        threads=args.threads,
+        quick=args.quick,
+        parallel_walk=args.parallel_walk
+    )
 
     try:
         # Scan for duplicates
@@ -0,0 +1,98 @@
+"""
+Persistent content-hash cache backed by SQLite
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algo TEXT NOT NULL,
+    digest TEXT NOT NULL
+)
+"""
+
+
+def default_cache_path() -> Path:
+    """Default location of the cache database."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_home) / "doppel" / "hashes.sqlite"
+
+
+class HashCache:
+    """
+    Cache of (path, size, mtime_ns, algo) -> digest that survives runs.
+
+    Unchanged files (same size and mtime) are never rehashed across
+    scans. Writes are batched: store() does not commit, callers commit
+    once per batch (or on close) to amortize fsync cost.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (creating if needed) the cache database.
+
+        Args:
+            db_path: Database file location (default: ~/.cache/doppel)
+
+        Raises:
+            OSError: If the cache directory cannot be created
+            sqlite3.Error: If the database cannot be opened
+        """
+        if db_path is None:
+            db_path = default_cache_path()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # The scanner's hash workers share this connection; serialize
+        # access with a lock instead of per-thread connections.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def lookup(self, path: str, size: int, mtime_ns: int, algo: str) -> Optional[str]:
+        """
+        Return the cached digest for a file, or None on miss.
+
+        A row only hits if size, mtime_ns and algorithm all match, so a
+        modified file never returns a stale digest.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM hashes"
+                " WHERE path = ? AND size = ? AND mtime_ns = ? AND algo = ?",
+                (path, size, mtime_ns, algo)
+            ).fetchone()
+        return row[0] if row else None
+
+    def store(self, path: str, size: int, mtime_ns: int, algo: str, digest: str) -> None:
+        """Record a freshly computed digest (uncommitted; see commit())."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes"
+                " (path, size, mtime_ns, algo, digest) VALUES (?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, algo, digest)
+            )
+
+    def commit(self) -> None:
+        """Flush pending stores to disk."""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -2,12 +2,21 @@
 Interactive duplicate file removal functionality
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from collections import defaultdict
 from .scanner import FileInfo, DuplicateScanner
 from .utils import confirm_action, parse_indices
 
+# Below this many files, deletion stays serial — thread startup would
+# cost more than it saves
+_PARALLEL_DELETE_MIN = 4
+
+# Worker cap for parallel deletion batches
+_DELETE_WORKERS = 16
+
 
 class InteractiveRemover:
     """Handles interactive removal of duplicate files."""
@@ -22,6 +31,7 @@ class InteractiveRemover:
         self.scanner = scanner
         self.total_removed = 0
         self.total_space_freed = 0
+        self._totals_lock = threading.Lock()
 
     def process_duplicates_auto(self, duplicates: Dict[str, List[FileInfo]]) -> None:
         """
@@ -104,7 +114,7 @@ class InteractiveRemover:
         content_groups = None
         if self.scanner.compare_content:
             content_groups = self.scanner.group_by_content(file_list)
-            self._display_content_analysis(content_groups)
+            self._display_content_analysis(content_groups, file_list)
 
         # Interactive processing loop
         while True:
@@ -124,18 +134,25 @@ class InteractiveRemover:
                     break
             # If we get here, there was an error and we should ask again
 
-    def _display_content_analysis(self, content_groups: Dict[str, List[FileInfo]]) -> None:
-        """Display content analysis for duplicate files."""
+    def _display_content_analysis(self, content_groups: Dict[str, List[FileInfo]],
+                                  file_list: List[FileInfo]) -> None:
+        """Display content analysis for duplicate files.
+
+        Args:
+            content_groups: Hash groups from scanner.group_by_content
+            file_list: Files in display order (for the numbered labels)
+        """
         if len(content_groups) > 1:
             print(f"\n⚠️  Files have different content! ({len(content_groups)} unique versions)")
+            # One lookup table instead of rescanning file_list per file
+            path_to_idx = {
+                file_info.path: j
+                for j, file_info in enumerate(file_list, 1)
+            }
             for i, (hash_val, group) in enumerate(content_groups.items(), 1):
-                indices = []
-                for file_info in group:
-                    # Find the index of this file in the display
-                    for j, displayed_file in enumerate(file_list, 1):
-                        if displayed_file.path == file_info.path:
-                            indices.append(str(j))
-                            break
+                indices = [
+                    str(path_to_idx[file_info.path]) for file_info in group
+                ]
                 print(f"     Group {i} (hash {hash_val[:8]}...): files {', '.join(indices)}")
         else:
             print(f"\n✓ All files have identical content")
@@ -191,9 +208,7 @@ class InteractiveRemover:
 
         print(f"Keeping newest: {to_keep.path}")
 
-        for file_info in to_delete:
-            if self._delete_file(file_info):
-                print(f"Deleted: {file_info.path}")
+        self._batch_delete(to_delete)
 
     def _confirm_and_delete(self, indices: List[int], file_list: List[FileInfo]) -> bool:
         """
@@ -224,17 +239,42 @@ class InteractiveRemover:
             return False  # Don't break, let user try again
 
         # Perform deletions
-        deleted_count = 0
-        for file_info in files_to_delete:
-            if self._delete_file(file_info):
-                print(f"Deleted: {file_info.path}")
-                deleted_count += 1
+        deleted_count = self._batch_delete(files_to_delete)
 
         if deleted_count > 0:
             print(f"Successfully deleted {deleted_count} file(s).")
 
         return True  # Break from the choice loop
 
+    def _batch_delete(self, file_infos: List[FileInfo]) -> int:
+        """
+        Delete a batch of files, in parallel for larger batches.
+
+        Each unlink is a round trip on networked filesystems, so big
+        batches go through a thread pool to overlap the latency. Small
+        batches stay serial.
+
+        Args:
+            file_infos: FileInfo objects to delete
+
+        Returns:
+            Number of files successfully deleted
+        """
+        if len(file_infos) < _PARALLEL_DELETE_MIN:
+            results = [self._delete_file(fi) for fi in file_infos]
+        else:
+            workers = min(_DELETE_WORKERS, len(file_infos))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._delete_file, file_infos))
+
+        deleted_count = 0
+        for file_info, deleted in zip(file_infos, results):
+            if deleted:
+                print(f"Deleted: {file_info.path}")
+                deleted_count += 1
+
+        return deleted_count
+
     def _delete_file(self, file_info: FileInfo) -> bool:
         """
         Delete a single file.
@@ -247,8 +287,9 @@ class InteractiveRemover:
         """
         try:
             file_info.path.unlink()
-            self.total_removed += 1
-            self.total_space_freed += file_info.size
+            with self._totals_lock:
+                self.total_removed += 1
+                self.total_space_freed += file_info.size
             return True
         except OSError as e:
             print(f"Error deleting {file_info.path}: {e}")
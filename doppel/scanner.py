@@ -3,41 +3,97 @@ File scanning and duplicate detection functionality
 """
 
 import os
+import queue
+import sys
+import threading
+import time
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-from .utils import get_file_hash, format_size
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .hashcache import HashCache
+
+
+def default_thread_count() -> int:
+    """Default number of hash worker threads."""
+    return min(8, os.cpu_count() or 1)
+
+
+# Bytes hashed from each end of a file in --quick mode
+QUICK_HASH_LIMIT = 1 << 20
+
+# Minimum seconds between scan progress updates
+_PROGRESS_INTERVAL = 0.25
+
+# Concurrent directory reads in --parallel-walk mode
+_WALK_WORKERS = 16
 
 
-@dataclass
 class FileInfo:
-    """Information about a file for duplicate comparison."""
-    path: Path
-    size: int
-    modified: float
-    hash: Optional[str] = None
+    """
+    Information about a file for duplicate comparison.
+
+    Uses __slots__ rather than a dataclass: one instance exists per
+    candidate file, and skipping the per-instance __dict__ cuts memory
+    roughly in half on large trees.
+    """
+
+    __slots__ = ("path", "size", "modified", "hash")
+
+    def __init__(self, path: Path, size: int, modified: float,
+                 hash: Optional[str] = None):
+        self.path = path
+        self.size = size
+        self.modified = modified
+        self.hash = hash  # content hash (see utils.HASH_ALGORITHM)
+
+    def __repr__(self) -> str:
+        return (f"FileInfo(path={self.path!r}, size={self.size!r}, "
+                f"modified={self.modified!r}, hash={self.hash!r})")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileInfo):
+            return NotImplemented
+        return (self.path, self.size, self.modified, self.hash) == \
+            (other.path, other.size, other.modified, other.hash)
 
     @property
     def size_str(self) -> str:
         """Human-readable file size."""
+        from .utils import format_size
         return format_size(self.size)
 
 
 class DuplicateScanner:
     """Scans directories for duplicate files."""
 
-    def __init__(self, root_path: Path, compare_content: bool = False):
+    def __init__(self, root_path: Path, compare_content: bool = False,
+                 threads: Optional[int] = None, quick: bool = False,
+                 parallel_walk: bool = False):
         """
         Initialize scanner.
 
         Args:
             root_path: Root directory to scan
             compare_content: Whether to compare file content via hashing
+            threads: Number of hash worker threads (default: min(8, cpu_count))
+            quick: Hash only the head and tail of large files instead of
+                the full content (faster, probabilistic)
+            parallel_walk: Read directories concurrently; pays off on
+                high-latency (networked) filesystems
         """
         self.root_path = root_path.resolve()
         self.compare_content = compare_content
+        self.threads = threads if threads is not None else default_thread_count()
+        self.hash_limit = QUICK_HASH_LIMIT if quick else None
+        self.parallel_walk = parallel_walk
         self._scanned_files = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._hash_cache: Optional["HashCache"] = None
+        self._hash_cache_failed = False
 
     def scan(self) -> Dict[str, List[FileInfo]]:
         """
@@ -46,6 +102,23 @@ class DuplicateScanner:
         Returns:
             Dictionary mapping filenames to lists of FileInfo objects
 
+        Raises:
+            PermissionError: If access is denied to scan directory
+            FileNotFoundError: If root path doesn't exist
+        """
+        return dict(self.scan_iter())
+
+    def scan_iter(self) -> Iterator[Tuple[str, List[FileInfo]]]:
+        """
+        Scan for duplicate filenames, streaming one group at a time.
+
+        Unlike scan(), duplicate groups are yielded as they are built,
+        so display can start before the whole result set is
+        materialized and memory stays flat on huge trees.
+
+        Yields:
+            (filename, file_list) tuples, file_list sorted newest first
+
         Raises:
             PermissionError: If access is denied to scan directory
             FileNotFoundError: If root path doesn't exist
@@ -58,113 +131,379 @@ class DuplicateScanner:
 
         print(f"Scanning directory: {self.root_path}")
 
-        filename_map = defaultdict(list)
         self._scanned_files = 0
+        walk = self._walk_parallel if self.parallel_walk else self._walk
 
         try:
-            for filepath in self.root_path.rglob("*"):
-                if filepath.is_file():
+            # First pass: count lowered names only. No stat, no Path,
+            # no FileInfo — singletons never allocate anything
+            counts = Counter()
+            last_update = time.monotonic()
+            progress_shown = False
+            for entry in walk(self.root_path):
+                # Interning the lowered name makes repeated dict probes
+                # for common filenames (__init__.py, index.html, ...)
+                # compare by pointer and stores each key once
+                counts[sys.intern(entry.name.lower())] += 1  # Case-insensitive
+                self._scanned_files += 1
+
+                # Progress indicator for large scans: rewrite a single
+                # stderr line, at most a few times per second, instead
+                # of a write syscall every 1000 files
+                if self._scanned_files % 1000 == 0:
+                    now = time.monotonic()
+                    if now - last_update >= _PROGRESS_INTERVAL:
+                        sys.stderr.write(
+                            f"\rScanned {self._scanned_files} files..."
+                        )
+                        sys.stderr.flush()
+                        last_update = now
+                        progress_shown = True
+
+            if progress_shown:
+                sys.stderr.write("\n")
+                sys.stderr.flush()
+
+            dup_names = {name for name, count in counts.items() if count >= 2}
+            del counts
+
+            # Second pass: materialize FileInfo only for colliding
+            # names. The re-walk is cheap readdir traffic served from
+            # the page cache; the savings are per-singleton stats and
+            # allocations
+            filename_map = {}
+            if dup_names:
+                for entry in walk(self.root_path):
+                    filename = sys.intern(entry.name.lower())
+                    if filename not in dup_names:
+                        continue
                     try:
-                        file_info = self._create_file_info(filepath)
-                        filename = filepath.name.lower()  # Case-insensitive
-                        filename_map[filename].append(file_info)
-                        self._scanned_files += 1
-
-                        # Progress indicator for large scans
-                        if self._scanned_files % 1000 == 0:
-                            print(f"Scanned {self._scanned_files} files...")
-
+                        # DirEntry.stat() reuses data from the scandir
+                        # call where the platform provides it — no
+                        # second stat syscall per file
+                        filename_map.setdefault(filename, []).append(
+                            self._create_file_info(Path(entry.path),
+                                                   entry.stat())
+                        )
                     except (OSError, IOError) as e:
-                        print(f"Warning: Could not read {filepath}: {e}")
-                        continue
+                        print(f"Warning: Could not read {entry.path}: {e}")
 
         except PermissionError as e:
             raise PermissionError(f"Permission denied scanning directory: {e}")
 
         print(f"Scan complete. Found {self._scanned_files} files.")
 
-        # Filter to only duplicates and sort by modification time
-        duplicates = {}
         for filename, file_list in filename_map.items():
             if len(file_list) > 1:
-                # Sort by modification time (newest first)
-                file_list.sort(key=lambda f: f.modified, reverse=True)
-                duplicates[filename] = file_list
+                # Sort by modification time (newest first); attrgetter
+                # avoids a Python-level lambda call per comparison key
+                file_list.sort(key=attrgetter("modified"), reverse=True)
+                yield filename, file_list
+
+    def _walk(self, root: Path):
+        """
+        Walk a directory tree with os.scandir, yielding regular files.
+
+        Unlike Path.rglob("*") + is_file(), which costs a Path object
+        and an extra stat() per entry, scandir reports the entry type
+        from the readdir data itself. Entries are not stat()ed here at
+        all; callers stat only the entries they keep.
 
-        return duplicates
+        Args:
+            root: Directory to walk
 
-    def _create_file_info(self, filepath: Path) -> FileInfo:
+        Yields:
+            os.DirEntry objects for each regular file
+        """
+        root_str = str(root)
+        stack = [root_str]
+        while stack:
+            dirpath = stack.pop()
+            try:
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                yield entry
+                        except (OSError, IOError) as e:
+                            print(f"Warning: Could not read {entry.path}: {e}")
+            except PermissionError:
+                # An unreadable root is fatal, but an unreadable
+                # subdirectory should not abort the rest of the scan
+                if dirpath == root_str:
+                    raise
+                print(f"Warning: Could not scan {dirpath}: Permission denied")
+            except (OSError, IOError) as e:
+                print(f"Warning: Could not scan {dirpath}: {e}")
+
+    def _walk_parallel(self, root: Path):
+        """
+        Parallel variant of _walk for high-latency filesystems.
+
+        A pool of worker threads reads directories concurrently, so on
+        networked filesystems dozens of readdir round trips overlap
+        instead of serializing. File entries are funneled through a
+        queue to the consuming generator. On fast local disks the
+        queue overhead usually outweighs the savings, so the serial
+        walker stays the default.
+
+        Args:
+            root: Directory to walk
+
+        Yields:
+            os.DirEntry objects for each regular file (unordered)
+        """
+        root_str = str(root)
+        results: "queue.Queue" = queue.Queue()
+        lock = threading.Lock()
+        # Count of directories submitted but not yet fully scanned;
+        # hitting zero means the walk is complete
+        outstanding = [1]
+
+        def scan_dir(dirpath: str) -> None:
+            try:
+                try:
+                    with os.scandir(dirpath) as entries:
+                        for entry in entries:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    with lock:
+                                        outstanding[0] += 1
+                                    pool.submit(scan_dir, entry.path)
+                                elif entry.is_file():
+                                    results.put(entry)
+                            except (OSError, IOError) as e:
+                                print(f"Warning: Could not read {entry.path}: {e}")
+                except PermissionError as e:
+                    if dirpath == root_str:
+                        # Forward to the consumer, matching _walk
+                        # semantics: only an unreadable root is fatal
+                        results.put(e)
+                    else:
+                        print(f"Warning: Could not scan {dirpath}: "
+                              f"Permission denied")
+                except (OSError, IOError) as e:
+                    print(f"Warning: Could not scan {dirpath}: {e}")
+            finally:
+                with lock:
+                    outstanding[0] -= 1
+                    if outstanding[0] == 0:
+                        results.put(None)  # End-of-walk sentinel
+
+        with ThreadPoolExecutor(max_workers=_WALK_WORKERS) as pool:
+            pool.submit(scan_dir, root_str)
+            while True:
+                item = results.get()
+                if item is None:
+                    break
+                if isinstance(item, PermissionError):
+                    raise item
+                yield item
+
+    def _create_file_info(self, filepath: Path, stat: os.stat_result) -> FileInfo:
         """
         Create FileInfo object for a file.
 
         Args:
             filepath: Path to the file
+            stat: Stat result for the file, typically os.DirEntry.stat()
+                from the walker so no extra syscall is issued
 
         Returns:
             FileInfo object with file metadata
-
-        Raises:
-            OSError: If file cannot be accessed
         """
-        try:
-            stat = filepath.stat()
-            file_info = FileInfo(
-                path=filepath,
-                size=stat.st_size,
-                modified=stat.st_mtime
-            )
-
-            if self.compare_content:
-                file_info.hash = get_file_hash(filepath)
-
-            return file_info
-
-        except (OSError, IOError) as e:
-            raise OSError(f"Cannot access file {filepath}: {e}")
+        return FileInfo(
+            path=filepath,
+            size=stat.st_size,
+            modified=stat.st_mtime
+        )
 
     def group_by_content(self, file_list: List[FileInfo]) -> Dict[str, List[FileInfo]]:
         """
         Group files by content hash.
 
+        Files of different size can never be content-duplicates, so files
+        are bucketed by size first and only same-size candidates are
+        hashed. Files with a unique size get a synthetic "size:<n>" group
+        key and are never read; files whose first 4 KiB differs from all
+        other same-size candidates get a synthetic "head:<n>" key and
+        are never fully hashed.
+
         Args:
             file_list: List of FileInfo objects to group
 
         Returns:
-            Dictionary mapping hash values to lists of files
+            Dictionary mapping hash values (or synthetic "size:<n>" /
+            "head:<n>" keys for provably unique files) to lists of files
         """
-        if not self.compare_content:
-            # If not comparing content, compute hashes now
-            for file_info in file_list:
-                if file_info.hash is None:
-                    file_info.hash = get_file_hash(file_info.path)
-
-        hash_groups = defaultdict(list)
+        # Fast path: a pair of different-size files needs no hashing
+        if len(file_list) == 2 and file_list[0].size != file_list[1].size:
+            return {
+                f"size:{file_info.size}": [file_info]
+                for file_info in file_list
+            }
+
+        from .utils import read_head
+
+        # Most sizes occur once, so buckets start as a bare FileInfo
+        # and only become a list on the second occurrence — no
+        # single-element list allocation per unique size
+        size_buckets = {}
         for file_info in file_list:
+            current = size_buckets.get(file_info.size)
+            if current is None:
+                size_buckets[file_info.size] = file_info
+            elif type(current) is list:
+                current.append(file_info)
+            else:
+                size_buckets[file_info.size] = [current, file_info]
+
+        hash_groups = {}
+        to_hash = []
+        pending = []
+        unique_heads = 0
+
+        for size, bucket in size_buckets.items():
+            if type(bucket) is not list:
+                # Unique size cannot match anything; skip hashing entirely
+                hash_groups[f"size:{size}"] = [bucket]
+                continue
+
+            # Within a size bucket, compare the first 4 KiB directly:
+            # one small read rejects most non-duplicates before any
+            # full-file hashing happens. Same scalar-or-list pattern
+            head_groups = {}
+            for file_info in bucket:
+                head = read_head(file_info.path)
+                current = head_groups.get(head)
+                if current is None:
+                    head_groups[head] = file_info
+                elif type(current) is list:
+                    current.append(file_info)
+                else:
+                    head_groups[head] = [current, file_info]
+
+            for group in head_groups.values():
+                if type(group) is not list:
+                    # Unique head among same-size candidates; no hash
+                    unique_heads += 1
+                    hash_groups[f"head:{unique_heads}"] = [group]
+                else:
+                    to_hash.extend(
+                        file_info for file_info in group
+                        if file_info.hash is None
+                    )
+                    pending.extend(group)
+
+        # Hash the surviving candidates in one batch so the work can be
+        # spread across the thread pool
+        self._hash_files(to_hash)
+
+        for file_info in pending:
             if file_info.hash:  # Skip files that couldn't be hashed
-                hash_groups[file_info.hash].append(file_info)
+                hash_groups.setdefault(file_info.hash, []).append(file_info)
 
-        return dict(hash_groups)
+        return hash_groups
 
-    def display_duplicates(self, duplicates: Dict[str, List[FileInfo]]) -> None:
+    def _hash_files(self, file_list: List[FileInfo]) -> None:
         """
-        Display duplicate files in a formatted way.
+        Compute content hashes for a batch of files.
+
+        Uses the thread pool when more than one file needs hashing;
+        hashlib releases the GIL for reads over 2KB, so workers overlap
+        both IO and hash computation.
 
         Args:
-            duplicates: Dictionary of duplicate files from scan()
+            file_list: FileInfo objects whose hash should be filled in
         """
-        if not duplicates:
-            print("No duplicate filenames found!")
+        if not file_list:
             return
 
-        total_sets = len(duplicates)
-        total_files = sum(len(files) for files in duplicates.values())
+        from .utils import get_file_hash
+
+        cache = self._get_hash_cache()
 
-        print(f"\nFound {total_sets} sets of duplicate filenames ({total_files} total files):")
-        print("=" * 60)
+        if self.threads > 1 and len(file_list) > 1:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.threads)
+            digests = self._pool.map(
+                lambda file_info: get_file_hash(
+                    file_info.path, limit=self.hash_limit, cache=cache
+                ),
+                file_list
+            )
+            for file_info, digest in zip(file_list, digests):
+                file_info.hash = digest
+        else:
+            for file_info in file_list:
+                file_info.hash = get_file_hash(
+                    file_info.path, limit=self.hash_limit, cache=cache
+                )
+
+        if cache is not None:
+            # One commit per batch amortizes the fsync cost
+            cache.commit()
+
+    def _get_hash_cache(self) -> Optional["HashCache"]:
+        """Open the persistent hash cache lazily; None if unavailable."""
+        if self._hash_cache is None and not self._hash_cache_failed:
+            # Deferred import: sqlite3 is only loaded once hashing
+            # actually happens
+            import sqlite3
+            from .hashcache import HashCache
+            try:
+                self._hash_cache = HashCache()
+            except (OSError, sqlite3.Error):
+                # Unwritable cache dir; scan without persistence
+                self._hash_cache_failed = True
+        return self._hash_cache
+
+    def display_duplicates(
+        self,
+        duplicates: Union[Dict[str, List[FileInfo]],
+                          Iterator[Tuple[str, List[FileInfo]]]]
+    ) -> None:
+        """
+        Display duplicate files in a formatted way.
 
-        for filename, file_list in duplicates.items():
+        Args:
+            duplicates: Dictionary of duplicate files from scan(), or
+                the streaming iterator from scan_iter() — in the
+                latter case groups are printed as they arrive and the
+                totals are reported at the end instead
+        """
+        if isinstance(duplicates, dict):
+            if not duplicates:
+                print("No duplicate filenames found!")
+                return
+
+            total_sets = len(duplicates)
+            total_files = sum(len(files) for files in duplicates.values())
+
+            print(f"\nFound {total_sets} sets of duplicate filenames ({total_files} total files):")
+            print("=" * 60)
+
+            for filename, file_list in duplicates.items():
+                self._display_duplicate_set(filename, file_list)
+            return
+
+        total_sets = 0
+        total_files = 0
+        for filename, file_list in duplicates:
+            if total_sets == 0:
+                print("\nDuplicate filenames:")
+                print("=" * 60)
+            total_sets += 1
+            total_files += len(file_list)
             self._display_duplicate_set(filename, file_list)
 
+        if total_sets == 0:
+            print("No duplicate filenames found!")
+        else:
+            print(f"\nFound {total_sets} sets of duplicate filenames ({total_files} total files).")
+
     def _display_duplicate_set(self, filename: str, file_list: List[FileInfo]) -> None:
         """Display a single set of duplicate files."""
         print(f"\nFilename: {filename}")
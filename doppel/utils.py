@@ -2,35 +2,236 @@
 Utility functions for doppel package
 """
 
+import functools
 import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from .hashcache import HashCache
 
-def get_file_hash(filepath: Path) -> str:
+# Buffer size for the chunked fallback reader (pre-3.11 interpreters).
+_READ_BUFFER_SIZE = 1 << 20
+
+# Files larger than this are memory-mapped for hashing, letting the hash
+# primitive read kernel pages directly instead of copying into per-chunk
+# bytes objects.
+_MMAP_THRESHOLD = 1 << 16
+
+# Pick the fastest available hash at import time. Duplicate detection is
+# not a cryptographic use, so preference order is raw throughput: BLAKE3
+# (optional dependency, SIMD + multithreaded) > BLAKE2b > MD5.
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+if _blake3 is not None:
+    HASH_ALGORITHM = "blake3"
+
+    def _new_hasher():
+        return _blake3(max_threads=_blake3.AUTO)
+elif hasattr(hashlib, "blake2b"):
+    HASH_ALGORITHM = "blake2b"
+
+    def _new_hasher():
+        return hashlib.blake2b()
+else:
+    HASH_ALGORITHM = "md5"
+
+    def _new_hasher():
+        return hashlib.md5()
+
+
+def _hasher_factory(algorithm: Optional[str]):
     """
-    Calculate MD5 hash of a file for content comparison.
+    Return a zero-argument hasher constructor for `algorithm`.
+
+    None selects the import-time default (HASH_ALGORITHM). Other names
+    go through hashlib.new, so anything the interpreter's OpenSSL
+    build supports is accepted; unknown names raise ValueError.
+    """
+    if algorithm is None or algorithm == HASH_ALGORITHM:
+        return _new_hasher
+    if algorithm == "blake3":
+        if _blake3 is None:
+            raise ValueError("blake3 is not installed")
+        return lambda: _blake3(max_threads=_blake3.AUTO)
+    hashlib.new(algorithm)  # reject unknown names up front
+    return lambda: hashlib.new(algorithm)
+
+
+# Process-local memo of computed digests keyed by
+# (path, mtime_ns, size, algo). The same path is commonly hashed more
+# than once per run; the key invalidates itself when the file changes.
+# Entries are ~100 bytes, so even huge scans stay small.
+_HASH_CACHE: dict = {}
+
+
+def get_file_hash(filepath: Path, *, limit: Optional[int] = None,
+                  cache: Optional["HashCache"] = None,
+                  algorithm: Optional[str] = None) -> str:
+    """
+    Calculate content hash of a file for duplicate comparison.
+
+    By default the algorithm is chosen at import time (see
+    HASH_ALGORITHM): BLAKE3 when the optional blake3 package is
+    installed, otherwise BLAKE2b, otherwise MD5. Uses
+    hashlib.file_digest() on Python 3.11+, which runs the whole
+    read/update loop in C instead of dispatching per chunk from Python.
+
+    Digests are additionally memoized in-process by (path, mtime,
+    size), so an unchanged file is hashed at most once per run.
 
     Args:
         filepath: Path to the file
+        limit: When set and the file is larger than 2*limit bytes, hash
+            only the first and last `limit` bytes plus the file size
+            instead of the full content (fast but probabilistic)
+        cache: Optional persistent HashCache; files whose size and mtime
+            are unchanged since a previous run are not rehashed
+        algorithm: Hash algorithm name for interoperability (e.g.
+            "md5", "sha256"); None uses the fast default
 
     Returns:
-        MD5 hash as hexadecimal string, empty string if error
+        Content hash as hexadecimal string, empty string if error
+
+    Raises:
+        ValueError: If `algorithm` is not available
     """
-    hash_md5 = hashlib.md5()
+    new_hasher = _hasher_factory(algorithm)
+    algo_name = algorithm or HASH_ALGORITHM
+
+    algo = algo_name if limit is None else f"{algo_name}:limit={limit}"
+
     try:
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            stat = os.fstat(f.fileno())
+
+            memo_key = (str(filepath), stat.st_mtime_ns, stat.st_size, algo)
+            memoized = _HASH_CACHE.get(memo_key)
+            if memoized is not None:
+                return memoized
+
+            if cache is not None:
+                cached = cache.lookup(
+                    str(filepath), stat.st_size, stat.st_mtime_ns, algo
+                )
+                if cached is not None:
+                    _HASH_CACHE[memo_key] = cached
+                    return cached
+
+            digest = _compute_hash(f, stat.st_size, limit, new_hasher)
+            _HASH_CACHE[memo_key] = digest
+
+            if cache is not None:
+                cache.store(
+                    str(filepath), stat.st_size, stat.st_mtime_ns, algo, digest
+                )
+            return digest
     except (OSError, IOError):
         return ""
 
 
+def _compute_hash(f, size: int, limit: Optional[int], new_hasher=_new_hasher) -> str:
+    """Hash an open binary file (see get_file_hash for the strategy)."""
+    if limit is not None and size > 2 * limit:
+        # Head + tail + size is near-collision-free among same-size
+        # candidates and skips the bulk of the IO
+        hasher = new_hasher()
+        hasher.update(f.read(limit))
+        f.seek(size - limit)
+        hasher.update(f.read(limit))
+        hasher.update(struct.pack("<q", size))
+        return hasher.hexdigest()
+
+    if size <= _MMAP_THRESHOLD:
+        # Small files: one read and one update beat mapping overhead
+        hasher = new_hasher()
+        hasher.update(f.read())
+        return hasher.hexdigest()
+
+    digest = _hash_mmap(f, new_hasher)
+    if digest is not None:
+        return digest
+    # mmap can fail on odd file types (e.g. /proc); fall through to
+    # the streaming path, asking the kernel for aggressive readahead
+    # so I/O overlaps with hashing
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    f.seek(0)
+
+    if sys.version_info >= (3, 11):
+        return hashlib.file_digest(f, new_hasher).hexdigest()
+
+    hasher = new_hasher()
+    for chunk in iter(lambda: f.read(_READ_BUFFER_SIZE), b""):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _hash_mmap(f, new_hasher=_new_hasher) -> Optional[str]:
+    """
+    Hash an open binary file via mmap, or None if mapping fails.
+
+    The hash primitive sees kernel pages directly, avoiding a bytes
+    copy per chunk, and MADV_SEQUENTIAL hints the kernel prefetcher
+    where available.
+    """
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            hasher = new_hasher()
+            hasher.update(mm)
+            return hasher.hexdigest()
+    except (ValueError, OSError):
+        return None
+
+
+def read_head(filepath: Path, n: int = 4096) -> bytes:
+    """
+    Read the first n bytes of a file.
+
+    Cheap discriminator used before full hashing: same-size files that
+    differ usually differ within the first block (headers, magic
+    numbers), and one small read beats hashing the whole file.
+
+    Args:
+        filepath: Path to the file
+        n: Number of bytes to read
+
+    Returns:
+        Leading bytes of the file, empty bytes if error
+    """
+    try:
+        with open(filepath, "rb") as f:
+            return f.read(n)
+    except (OSError, IOError):
+        return b""
+
+
+_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+@functools.lru_cache(maxsize=4096)
 def format_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
 
+    The unit tier is picked in O(1) from the bit length (each power of
+    1024 adds 10 bits) instead of a divide-and-compare loop. Results
+    are memoized — many files share the same size, and display passes
+    format each one.
+
     Args:
         size_bytes: Size in bytes
 
@@ -40,11 +241,9 @@ def format_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
 
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    tier = (int(size_bytes).bit_length() - 1) // 10
+    tier = max(0, min(tier, len(_UNITS) - 1))
+    return f"{size_bytes / (1 << (10 * tier)):.1f} {_UNITS[tier]}"
 
 
 def safe_path_str(path: Path, max_length: Optional[int] = None) -> str:
@@ -87,10 +286,22 @@ def confirm_action(prompt: str, default: bool = False) -> bool:
     return response in ('y', 'yes', 'true', '1')
 
 
+# Valid index token: digits only (validated without raising per token)
+_INDEX_RE = re.compile(r"\d+")
+
+# Whole input that the fast path can handle: digits, commas, whitespace
+_FAST_INPUT_RE = re.compile(r"[\d,\s]+")
+
+
 def parse_indices(input_str: str, max_index: int) -> list[int]:
     """
     Parse comma-separated indices from user input.
 
+    Well-formed input (the overwhelmingly common case) is converted in
+    one C-level map(int, split) pass; anything else falls back to a
+    per-token loop that collects precise diagnostics. This keeps large
+    selections (thousands of indices) out of the interpreter loop.
+
     Args:
         input_str: User input string (e.g., "1,3,5" or "2")
         max_index: Maximum valid index
@@ -99,28 +310,44 @@ def parse_indices(input_str: str, max_index: int) -> list[int]:
         List of valid indices
 
     Raises:
-        ValueError: If input format is invalid
+        ValueError: If input format is invalid; all bad tokens are
+            reported in a single exception
     """
     if not input_str.strip():
         return []
 
-    indices = []
-    parts = input_str.split(',')
+    if _FAST_INPUT_RE.fullmatch(input_str) and ",," not in input_str:
+        try:
+            indices = set(map(int, input_str.split(',')))
+        except ValueError:
+            pass  # stray empty/space-only token; diagnose below
+        else:
+            if 1 <= min(indices) and max(indices) <= max_index:
+                return sorted(indices)
+
+    return _parse_indices_slow(input_str, max_index)
 
-    for part in parts:
+
+def _parse_indices_slow(input_str: str, max_index: int) -> list[int]:
+    """Tokenwise parse of index input; collects all error messages."""
+    indices = set()
+    errors = []
+
+    for part in input_str.split(','):
         part = part.strip()
         if not part:
             continue
 
-        try:
+        if _INDEX_RE.fullmatch(part):
             index = int(part)
             if 1 <= index <= max_index:
-                indices.append(index)
+                indices.add(index)
             else:
-                raise ValueError(f"Index {index} out of range (1-{max_index})")
-        except ValueError as e:
-            if "invalid literal" in str(e):
-                raise ValueError(f"'{part}' is not a valid number")
-            raise
+                errors.append(f"Index {index} out of range (1-{max_index})")
+        else:
+            errors.append(f"'{part}' is not a valid number")
+
+    if errors:
+        raise ValueError("; ".join(errors))
 
-    return sorted(list(set(indices)))  # Remove duplicates and sort
\ No newline at end of file
+    return sorted(indices)  # Duplicates already collapsed by the set
\ No newline at end of file
@@ -57,6 +57,8 @@ setup(
         "dev": [
             "pytest>=6.0",
             "pytest-cov",
+            "pytest-xdist",
+            "hypothesis",
             "black",
             "flake8",
             "mypy",
@@ -0,0 +1,116 @@
+"""
+Shared pytest fixtures for doppel tests
+"""
+
+import os
+
+import pytest
+
+# (relative path, content) pairs for the shared tree, pre-encoded so the
+# builder can write raw bytes without a TextIOWrapper per file
+_TREE_FILES = tuple(
+    (path, content.encode())
+    for path, content in (
+        ("file1.txt", "hello"),
+        ("file2.txt", "world"),
+        ("subdir1/file1.txt", "hello"),
+        ("subdir1/file3.txt", "test"),
+        ("subdir2/file1.txt", "different"),
+        ("subdir2/file2.txt", "world"),
+    )
+)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolate_hash_cache(tmp_path_factory):
+    """
+    Point the persistent hash cache at a per-session temp directory.
+
+    Content-comparison tests hash through HashCache, which defaults to
+    ~/.cache/doppel; without this the suite would write into (and read
+    stale digests from) the developer's real cache.
+    """
+    mp = pytest.MonkeyPatch()
+    mp.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+    yield
+    mp.undo()
+
+
+@pytest.fixture(scope="session")
+def shared_tmp_tree(tmp_path_factory):
+    """
+    Session-wide directory tree with known duplicate filenames.
+
+    Built once and shared by every test that only reads it, saving a
+    mkdir/rmtree cycle (and the stat traffic that goes with it) per
+    test. Tests that mutate the filesystem must build their own tree.
+
+    Layout:
+        tree/
+          ├── file1.txt (content: "hello")
+          ├── file2.txt (content: "world")
+          ├── subdir1/
+          │   ├── file1.txt (content: "hello")      # dup name, same content
+          │   └── file3.txt (content: "test")
+          └── subdir2/
+              ├── file1.txt (content: "different")  # dup name, diff content
+              └── file2.txt (content: "world")      # dup name, same content
+    """
+    tree = tmp_path_factory.mktemp("tree")
+
+    os.mkdir(tree / "subdir1")
+    os.mkdir(tree / "subdir2")
+    for relpath, content in _TREE_FILES:
+        fd = os.open(tree / relpath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+
+    yield tree
+
+    # Teardown driven by the same table: straight unlink/rmdir calls,
+    # no recursive scandir + per-entry lstat like the rmtree pytest
+    # would otherwise run at session end
+    for relpath, _ in _TREE_FILES:
+        os.unlink(tree / relpath)
+    os.rmdir(tree / "subdir1")
+    os.rmdir(tree / "subdir2")
+    os.rmdir(tree)
+
+
+# Canonical inputs for the hash tests, keyed by a short label
+_CANONICAL_FILES = {
+    "empty": b"",
+    "test-content": b"test content",
+    "content1": b"content1",
+    "content2": b"content2",
+}
+
+
+@pytest.fixture(scope="session")
+def canonical_files(tmp_path_factory):
+    """
+    Canonical hash-test input files, materialized once per session.
+
+    Maps each label in _CANONICAL_FILES to a file with that content.
+    Tests that only read file content share these instead of creating
+    and deleting their own copies.
+    """
+    directory = tmp_path_factory.mktemp("hash")
+    paths = {}
+    for label, content in _CANONICAL_FILES.items():
+        path = directory / f"{label}.bin"
+        path.write_bytes(content)
+        paths[label] = path
+    return paths
+
+
+@pytest.fixture(scope="session")
+def shared_tmp_tree_resolved(shared_tmp_tree):
+    """Resolved shared_tmp_tree as a string, computed once per session.
+
+    Kept as a string so assertions compare without re-entering Path
+    construction and PurePath.__eq__ on every check.
+    """
+    return str(shared_tmp_tree.resolve())
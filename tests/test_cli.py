@@ -10,12 +10,29 @@ from unittest.mock import patch, MagicMock
 from doppel.cli import create_parser, validate_directory, main
 
 
+@pytest.fixture(scope="module")
+def scan_dir(tmp_path_factory):
+    """One real directory reused by every main() invocation."""
+    return str(tmp_path_factory.mktemp("scan"))
+
+
+@pytest.fixture(scope="session")
+def parser():
+    """Shared parser instance; create_parser caches it anyway."""
+    return create_parser()
+
+
+@pytest.fixture(scope="session")
+def cwd_resolved():
+    """Resolved current directory as a string, computed once per session."""
+    return str(Path(".").resolve())
+
+
 class TestCreateParser:
     """Test cases for create_parser function."""
 
-    def test_parser_creation(self):
+    def test_parser_creation(self, parser):
         """Test that parser is created correctly."""
-        parser = create_parser()
         assert parser.prog == "doppel"
 
         # Test default arguments
@@ -25,15 +42,17 @@ class TestCreateParser:
         assert args.dry_run is False
         assert args.verbose is False
 
-    def test_parser_with_directory(self):
+    def test_parser_is_cached(self, parser):
+        """Test that create_parser returns the same instance."""
+        assert create_parser() is parser
+
+    def test_parser_with_directory(self, parser):
         """Test parser with directory argument."""
-        parser = create_parser()
         args = parser.parse_args(["/path/to/dir"])
         assert args.directory == "/path/to/dir"
 
-    def test_parser_with_flags(self):
+    def test_parser_with_flags(self, parser):
         """Test parser with various flags."""
-        parser = create_parser()
         args = parser.parse_args(["--content", "--dry-run", "--verbose", "/test/dir"])
 
         assert args.content is True
@@ -41,17 +60,23 @@ class TestCreateParser:
         assert args.verbose is True
         assert args.directory == "/test/dir"
 
-    def test_parser_help(self):
-        """Test that parser shows help without errors."""
-        parser = create_parser()
+    def test_parser_performance_flags(self, parser):
+        """Test the --quick and --threads flags and their defaults."""
+        args = parser.parse_args(["--quick", "--threads", "4", "/test/dir"])
+        assert args.quick is True
+        assert args.threads == 4
 
+        defaults = parser.parse_args([])
+        assert defaults.quick is False
+        assert defaults.threads is None
+
+    def test_parser_help(self, parser):
+        """Test that parser shows help without errors."""
         with pytest.raises(SystemExit):
             parser.parse_args(["--help"])
 
-    def test_parser_version(self):
+    def test_parser_version(self, parser):
         """Test that parser shows version without errors."""
-        parser = create_parser()
-
         with pytest.raises(SystemExit):
             parser.parse_args(["--version"])
 
@@ -59,11 +84,10 @@ class TestCreateParser:
 class TestValidateDirectory:
     """Test cases for validate_directory function."""
 
-    def test_valid_directory(self):
+    def test_valid_directory(self, shared_tmp_tree, shared_tmp_tree_resolved):
         """Test validation of valid directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result = validate_directory(temp_dir)
-            assert result == Path(temp_dir).resolve()
+        result = validate_directory(str(shared_tmp_tree))
+        assert str(result) == shared_tmp_tree_resolved
 
     def test_nonexistent_directory(self):
         """Test validation of nonexistent directory."""
@@ -76,166 +100,105 @@ class TestValidateDirectory:
             with pytest.raises(SystemExit):
                 validate_directory(temp_file.name)
 
-    def test_current_directory(self):
+    def test_current_directory(self, cwd_resolved):
         """Test validation of current directory."""
         result = validate_directory(".")
-        assert result == Path(".").resolve()
+        assert str(result) == cwd_resolved
+
+
+# Pre-built scanner for cases that need an empty scan result; constructed
+# once, reset (call history only) by the tests that use it
+_EMPTY_SCANNER = MagicMock()
+_EMPTY_SCANNER.scan.return_value = {}
 
 
 class TestMain:
-    """Test cases for main function."""
-
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('doppel.cli.InteractiveRemover')
-    @patch('sys.argv', ['doppel', '--dry-run'])
-    def test_main_dry_run(self, mock_remover_class, mock_scanner_class):
-        """Test main function with dry-run flag."""
-        # Mock scanner
-        mock_scanner = MagicMock()
-        mock_scanner.scan.return_value = {"test.txt": []}
-        mock_scanner_class.return_value = mock_scanner
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', '--dry-run', temp_dir]):
-                main()
-
-        # Should create scanner and call scan
-        mock_scanner_class.assert_called_once()
-        mock_scanner.scan.assert_called_once()
-        mock_scanner.display_duplicates.assert_called_once()
-
-        # Should not create remover in dry-run mode
-        mock_remover_class.assert_not_called()
-
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('doppel.cli.InteractiveRemover')
-    @patch('builtins.input', return_value='n')  # User says no to removal
-    @patch('sys.argv', ['doppel'])
-    def test_main_with_duplicates_no_removal(self, mock_remover_class, mock_scanner_class, mock_input):
-        """Test main function with duplicates but user declines removal."""
-        # Mock scanner with duplicates
-        mock_scanner = MagicMock()
-        mock_scanner.scan.return_value = {"test.txt": ["file1", "file2"]}
-        mock_scanner_class.return_value = mock_scanner
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', temp_dir]):
-                main()
-
-        # Should create scanner and call scan
-        mock_scanner_class.assert_called_once()
-        mock_scanner.scan.assert_called_once()
-
-        # Should not create remover since user declined
-        mock_remover_class.assert_not_called()
-
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('doppel.cli.InteractiveRemover')
-    @patch('builtins.input', return_value='y')  # User says yes to removal
-    @patch('sys.argv', ['doppel'])
-    def test_main_with_duplicates_with_removal(self, mock_remover_class, mock_scanner_class, mock_input):
-        """Test main function with duplicates and user accepts removal."""
-        # Mock scanner with duplicates
-        mock_scanner = MagicMock()
-        mock_scanner.scan.return_value = {"test.txt": ["file1", "file2"]}
-        mock_scanner_class.return_value = mock_scanner
-
-        # Mock remover
-        mock_remover = MagicMock()
-        mock_remover_class.return_value = mock_remover
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', temp_dir]):
-                main()
-
-        # Should create both scanner and remover
-        mock_scanner_class.assert_called_once()
-        mock_remover_class.assert_called_once_with(mock_scanner)
-
-        # Should call process_duplicates
-        mock_remover.process_duplicates.assert_called_once()
-
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('sys.argv', ['doppel'])
-    def test_main_no_duplicates(self, mock_scanner_class):
-        """Test main function when no duplicates are found."""
-        # Mock scanner with no duplicates
-        mock_scanner = MagicMock()
-        mock_scanner.scan.return_value = {}
-        mock_scanner_class.return_value = mock_scanner
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', temp_dir]):
-                main()
-
-        # Should create scanner and call scan
-        mock_scanner_class.assert_called_once()
-        mock_scanner.scan.assert_called_once()
-
-    @patch('sys.argv', ['doppel', '/nonexistent'])
-    def test_main_invalid_directory(self):
+    """Test cases for main function.
+
+    The scanner/remover classes are swapped for module-level mock
+    singletons by an autouse fixture and reset per case; sys.argv is
+    set via monkeypatch. One parametrized driver covers the
+    scan-outcome matrix instead of a patch stack per scenario.
+    """
+
+    _SCANNER_CLS = MagicMock()
+    _REMOVER_CLS = MagicMock()
+
+    @pytest.fixture(autouse=True)
+    def _patched_classes(self, monkeypatch):
+        """Install the shared class mocks, cleared for each case."""
+        self._SCANNER_CLS.reset_mock(return_value=True, side_effect=True)
+        self._REMOVER_CLS.reset_mock(return_value=True, side_effect=True)
+        monkeypatch.setattr("doppel.cli.DuplicateScanner", self._SCANNER_CLS)
+        monkeypatch.setattr("doppel.cli.InteractiveRemover", self._REMOVER_CLS)
+
+    @pytest.mark.parametrize("flags,input_value,scan_result,expect_remover", [
+        (["--dry-run"], None, {"test.txt": []}, False),
+        ([], "n", {"test.txt": ["file1", "file2"]}, True),
+        ([], "y", {"test.txt": ["file1", "file2"]}, True),
+        ([], None, {}, False),
+    ], ids=["dry-run", "duplicates-declined", "duplicates-accepted", "no-duplicates"])
+    def test_main_scan_outcomes(self, monkeypatch, scan_dir, flags,
+                                input_value, scan_result, expect_remover):
+        """Test scanner/remover wiring across the main scan outcomes."""
+        scanner = self._SCANNER_CLS.return_value
+        scanner.scan.return_value = scan_result
+        monkeypatch.setattr(sys, "argv", ["doppel", *flags, scan_dir])
+        if input_value is not None:
+            monkeypatch.setattr("builtins.input", lambda prompt="": input_value)
+
+        main()
+
+        self._SCANNER_CLS.assert_called_once()
+        scanner.scan.assert_called_once()
+        scanner.display_duplicates.assert_called_once_with(scan_result)
+
+        if expect_remover:
+            # The removal prompt lives inside process_duplicates, so the
+            # remover is constructed whenever duplicates exist
+            self._REMOVER_CLS.assert_called_once_with(scanner)
+            self._REMOVER_CLS.return_value.process_duplicates.assert_called_once_with(scan_result)
+        else:
+            self._REMOVER_CLS.assert_not_called()
+
+    def test_main_invalid_directory(self, monkeypatch):
         """Test main function with invalid directory."""
+        monkeypatch.setattr(sys, "argv", ["doppel", "/nonexistent"])
+
+        with pytest.raises(SystemExit):
+            main()
+
+    @pytest.mark.parametrize("error", [KeyboardInterrupt, PermissionError],
+                             ids=["keyboard-interrupt", "permission-error"])
+    def test_main_scan_errors(self, monkeypatch, scan_dir, error):
+        """Test main function exits on scan errors."""
+        self._SCANNER_CLS.return_value.scan.side_effect = error("Access denied")
+        monkeypatch.setattr(sys, "argv", ["doppel", scan_dir])
+
         with pytest.raises(SystemExit):
             main()
 
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('sys.argv', ['doppel'])
-    def test_main_keyboard_interrupt(self, mock_scanner_class):
-        """Test main function handles keyboard interrupt."""
-        # Mock scanner to raise KeyboardInterrupt
-        mock_scanner = MagicMock()
-        mock_scanner.scan.side_effect = KeyboardInterrupt()
-        mock_scanner_class.return_value = mock_scanner
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', temp_dir]):
-                with pytest.raises(SystemExit):
-                    main()
-
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('sys.argv', ['doppel'])
-    def test_main_permission_error(self, mock_scanner_class):
-        """Test main function handles permission error."""
-        # Mock scanner to raise PermissionError
-        mock_scanner = MagicMock()
-        mock_scanner.scan.side_effect = PermissionError("Access denied")
-        mock_scanner_class.return_value = mock_scanner
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', temp_dir]):
-                with pytest.raises(SystemExit):
-                    main()
-
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('sys.argv', ['doppel', '--content'])
-    def test_main_with_content_flag(self, mock_scanner_class):
+    def test_main_with_content_flag(self, monkeypatch, scan_dir):
         """Test main function with content comparison flag."""
-        mock_scanner = MagicMock()
-        mock_scanner.scan.return_value = {}
-        mock_scanner_class.return_value = mock_scanner
+        _EMPTY_SCANNER.reset_mock()
+        self._SCANNER_CLS.return_value = _EMPTY_SCANNER
+        monkeypatch.setattr(sys, "argv", ["doppel", "--content", scan_dir])
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', '--content', temp_dir]):
-                main()
+        main()
 
         # Should create scanner with content comparison enabled
-        mock_scanner_class.assert_called_once()
-        args, kwargs = mock_scanner_class.call_args
-        assert len(args) == 2
-        assert args[1] is True  # compare_content=True
-
-    @patch('doppel.cli.DuplicateScanner')
-    @patch('sys.argv', ['doppel', '--verbose'])
-    def test_main_with_verbose_flag(self, mock_scanner_class):
+        self._SCANNER_CLS.assert_called_once()
+        assert self._SCANNER_CLS.call_args.kwargs["compare_content"] is True
+
+    def test_main_with_verbose_flag(self, monkeypatch, scan_dir):
         """Test main function with verbose flag."""
-        mock_scanner = MagicMock()
-        mock_scanner.scan.return_value = {}
-        mock_scanner_class.return_value = mock_scanner
+        _EMPTY_SCANNER.reset_mock()
+        self._SCANNER_CLS.return_value = _EMPTY_SCANNER
+        monkeypatch.setattr(sys, "argv", ["doppel", "--verbose", scan_dir])
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('sys.argv', ['doppel', '--verbose', temp_dir]):
-                with patch('builtins.print') as mock_print:
-                    main()
+        with patch('builtins.print') as mock_print:
+            main()
 
         # Should print banner in verbose mode
-        mock_print.assert_any_call("doppel 1.0.0 - Duplicate file eliminator")
\ No newline at end of file
+        printed = {call.args for call in mock_print.call_args_list}
+        assert ("doppel 1.0.0 - Duplicate file eliminator",) in printed
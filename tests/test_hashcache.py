@@ -0,0 +1,58 @@
+"""
+Tests for doppel.hashcache module
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+from doppel.hashcache import HashCache
+from doppel.utils import get_file_hash
+
+
+class TestHashCache:
+    """Test cases for HashCache class."""
+
+    def test_lookup_miss_then_hit(self, tmp_path):
+        """Test that a stored digest is returned on matching lookup."""
+        with HashCache(tmp_path / "cache.sqlite") as cache:
+            assert cache.lookup("/some/file", 10, 123, "md5") is None
+
+            cache.store("/some/file", 10, 123, "md5", "abc123")
+            assert cache.lookup("/some/file", 10, 123, "md5") == "abc123"
+
+    def test_lookup_misses_on_changed_metadata(self, tmp_path):
+        """Test that size/mtime/algo changes invalidate the cache."""
+        with HashCache(tmp_path / "cache.sqlite") as cache:
+            cache.store("/some/file", 10, 123, "md5", "abc123")
+
+            assert cache.lookup("/some/file", 11, 123, "md5") is None
+            assert cache.lookup("/some/file", 10, 124, "md5") is None
+            assert cache.lookup("/some/file", 10, 123, "blake2b") is None
+
+    def test_persists_across_connections(self, tmp_path):
+        """Test that entries survive closing and reopening the cache."""
+        db_path = tmp_path / "cache.sqlite"
+
+        with HashCache(db_path) as cache:
+            cache.store("/some/file", 10, 123, "md5", "abc123")
+
+        with HashCache(db_path) as cache:
+            assert cache.lookup("/some/file", 10, 123, "md5") == "abc123"
+
+    def test_get_file_hash_uses_cached_digest(self, tmp_path, monkeypatch):
+        """Test that get_file_hash skips hashing on a cache hit."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+
+        with HashCache(tmp_path / "cache.sqlite") as cache:
+            first = get_file_hash(test_file, cache=cache)
+            assert first == get_file_hash(test_file)
+
+            # Empty the in-process memo, which is consulted first and
+            # would otherwise answer before the persistent cache does
+            monkeypatch.setattr("doppel.utils._HASH_CACHE", {})
+
+            with patch("doppel.utils._compute_hash") as mock_compute:
+                second = get_file_hash(test_file, cache=cache)
+
+            assert second == first
+            mock_compute.assert_not_called()
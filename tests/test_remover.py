@@ -3,51 +3,86 @@ Tests for doppel.remover module
 """
 
 import pytest
-import tempfile
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from doppel.remover import InteractiveRemover
-from doppel.scanner import DuplicateScanner, FileInfo
+
+# These tests patch process-wide state (builtins, Path.unlink); keep them
+# on one pytest-xdist worker while read-only tests distribute freely
+pytestmark = pytest.mark.xdist_group("remover_io")
+
+
+def _input_seq(*values):
+    """Build an input() replacement that returns values in order.
+
+    A direct closure over an iterator; no mock call-recording on the
+    hundreds of input() calls the interactive tests make.
+    """
+    iterator = iter(values)
+    return lambda *args, **kwargs: next(iterator)
+
+
+class _FakeScanner:
+    """Minimal scanner stand-in; avoids MagicMock's per-test spec introspection."""
+
+    compare_content = False
 
 
 class TestInteractiveRemover:
     """Test cases for InteractiveRemover class."""
 
+    @pytest.fixture(autouse=True)
+    def _silence_print(self, monkeypatch):
+        """Discard remover output; a plain attribute swap beats a
+        patch() enter/exit in every test. Tests that assert on output
+        layer their own patch('builtins.print') on top."""
+        monkeypatch.setattr("builtins.print", lambda *args, **kwargs: None)
+
     @pytest.fixture
     def mock_scanner(self):
-        """Create a mock scanner for testing."""
-        scanner = MagicMock(spec=DuplicateScanner)
-        scanner.compare_content = False
-        return scanner
+        """Create a fake scanner for testing."""
+        return _FakeScanner()
+
+    @pytest.fixture
+    def fake_fs(self, monkeypatch):
+        """In-memory stand-in for the filesystem.
+
+        The remover only ever touches files through Path.unlink(), so
+        a dict of live paths plus a patched unlink covers the whole
+        suite without a syscall per test.
+        """
+        files = {}
+
+        def fake_unlink(path, missing_ok=False):
+            try:
+                del files[str(path)]
+            except KeyError:
+                if not missing_ok:
+                    raise FileNotFoundError(2, "No such file or directory", str(path))
+
+        monkeypatch.setattr(Path, "unlink", fake_unlink)
+        return files
 
     @pytest.fixture
-    def sample_file_info(self):
-        """Create sample FileInfo objects for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Create test files
-            file1 = temp_path / "test1.txt"
-            file2 = temp_path / "test2.txt"
-            file1.write_text("content")
-            file2.write_text("content")
-
-            stat1 = file1.stat()
-            stat2 = file2.stat()
-
-            file_info1 = FileInfo(
-                path=file1,
-                size=stat1.st_size,
-                modified=stat1.st_mtime
-            )
-
-            file_info2 = FileInfo(
-                path=file2,
-                size=stat2.st_size,
-                modified=stat2.st_mtime
-            )
-
-            yield [file_info1, file_info2]
+    def sample_exists(self, fake_fs):
+        """Existence check against the fake filesystem."""
+        return lambda name: f"/virtual/{name}" in fake_fs
+
+    @pytest.fixture
+    def sample_file_info(self, fake_fs):
+        """Create sample FileInfo objects backed by the fake filesystem."""
+        from doppel.scanner import FileInfo
+
+        file_infos = []
+        for name, modified in (("test1.txt", 2.0), ("test2.txt", 1.0)):
+            path = Path("/virtual") / name
+            fake_fs[str(path)] = b"content"
+            file_infos.append(FileInfo(
+                path=path,
+                size=len(b"content"),
+                modified=modified
+            ))
+        return file_infos
 
     def test_remover_initialization(self, mock_scanner):
         """Test remover initialization."""
@@ -56,18 +91,29 @@ class TestInteractiveRemover:
         assert remover.total_removed == 0
         assert remover.total_space_freed == 0
 
-    @patch('builtins.input', return_value='n')
-    def test_process_duplicates_cancelled(self, mock_input, mock_scanner):
-        """Test that processing can be cancelled."""
+    @pytest.mark.parametrize("inputs,use_sample", [
+        (["n"], False),
+        (["y", "k"], True),
+        (["y", "1,2", "n", "k"], True),
+        (["y", "q"], True),
+    ], ids=["declined", "keep-all", "cancel-deletion", "quit"])
+    def test_process_duplicates_no_removal(self, inputs, use_sample,
+                                           monkeypatch, mock_scanner,
+                                           sample_file_info, sample_exists):
+        """Test the process_duplicates paths that must remove nothing."""
         remover = InteractiveRemover(mock_scanner)
-        duplicates = {"test.txt": []}
+        duplicates = {"test.txt": sample_file_info if use_sample else []}
 
-        with patch('builtins.print'):
-            remover.process_duplicates(duplicates)
+        monkeypatch.setattr("builtins.input", _input_seq(*inputs))
+        remover.process_duplicates(duplicates)
 
         # Should not have removed anything
         assert remover.total_removed == 0
 
+        # Files should still exist
+        for file_info in sample_file_info:
+            assert sample_exists(file_info.path.name)
+
     def test_process_duplicates_empty(self, mock_scanner):
         """Test processing with no duplicates."""
         remover = InteractiveRemover(mock_scanner)
@@ -78,83 +124,39 @@ class TestInteractiveRemover:
 
         mock_print.assert_any_call("No duplicates found - nothing to remove!")
 
-    @patch('builtins.input', side_effect=['y', 'k'])  # Accept processing, then keep files
-    def test_process_duplicates_keep_all(self, mock_input, mock_scanner, sample_file_info):
-        """Test keeping all files in a duplicate set."""
-        remover = InteractiveRemover(mock_scanner)
-        duplicates = {"test.txt": sample_file_info}
-
-        with patch('builtins.print'):
-            remover.process_duplicates(duplicates)
-
-        # Should not have removed anything
-        assert remover.total_removed == 0
-
-        # Files should still exist
-        for file_info in sample_file_info:
-            assert file_info.path.exists()
-
-    @patch('builtins.input', side_effect=['y', 'a'])  # Accept processing, then auto-remove
-    def test_process_duplicates_auto_remove(self, mock_input, mock_scanner, sample_file_info):
+    def test_process_duplicates_auto_remove(self, monkeypatch, mock_scanner, sample_file_info, sample_exists):
         """Test auto-removing oldest files."""
+        # Accept processing, then auto-remove
+        monkeypatch.setattr("builtins.input", _input_seq("y", "a"))
         remover = InteractiveRemover(mock_scanner)
         duplicates = {"test.txt": sample_file_info}
 
-        with patch('builtins.print'):
-            remover.process_duplicates(duplicates)
+        remover.process_duplicates(duplicates)
 
         # Should have removed one file (keeping the newest)
         assert remover.total_removed == 1
 
         # At least one file should still exist
-        existing_files = [f for f in sample_file_info if f.path.exists()]
+        existing_files = [f for f in sample_file_info if sample_exists(f.path.name)]
         assert len(existing_files) >= 1
 
-    @patch('builtins.input', side_effect=['y', '2', 'y'])  # Accept, select file 2, confirm
-    def test_process_duplicates_manual_selection(self, mock_input, mock_scanner, sample_file_info):
+    def test_process_duplicates_manual_selection(self, monkeypatch, mock_scanner, sample_file_info, sample_exists):
         """Test manually selecting files to delete."""
+        # Accept, select file 2, confirm
+        monkeypatch.setattr("builtins.input", _input_seq("y", "2", "y"))
         remover = InteractiveRemover(mock_scanner)
         duplicates = {"test.txt": sample_file_info}
 
-        with patch('builtins.print'):
-            remover.process_duplicates(duplicates)
+        remover.process_duplicates(duplicates)
 
         # Should have removed one file
         assert remover.total_removed == 1
 
         # File 1 should exist, file 2 should be deleted
-        assert sample_file_info[0].path.exists()
-        assert not sample_file_info[1].path.exists()
-
-    @patch('builtins.input', side_effect=['y', '1,2', 'n', 'k'])  # Select both, cancel, then keep
-    def test_process_duplicates_cancel_deletion(self, mock_input, mock_scanner, sample_file_info):
-        """Test cancelling deletion after selection."""
-        remover = InteractiveRemover(mock_scanner)
-        duplicates = {"test.txt": sample_file_info}
-
-        with patch('builtins.print'):
-            remover.process_duplicates(duplicates)
-
-        # Should not have removed anything due to cancellation
-        assert remover.total_removed == 0
+        assert sample_exists(sample_file_info[0].path.name)
+        assert not sample_exists(sample_file_info[1].path.name)
 
-        # Both files should still exist
-        for file_info in sample_file_info:
-            assert file_info.path.exists()
-
-    @patch('builtins.input', side_effect=['y', 'q'])  # Accept processing, then quit
-    def test_process_duplicates_quit(self, mock_input, mock_scanner, sample_file_info):
-        """Test quitting during processing."""
-        remover = InteractiveRemover(mock_scanner)
-        duplicates = {"test.txt": sample_file_info}
-
-        with patch('builtins.print'):
-            remover.process_duplicates(duplicates)
-
-        # Should not have removed anything
-        assert remover.total_removed == 0
-
-    def test_delete_file_success(self, mock_scanner, sample_file_info):
+    def test_delete_file_success(self, mock_scanner, sample_file_info, sample_exists):
         """Test successful file deletion."""
         remover = InteractiveRemover(mock_scanner)
         file_info = sample_file_info[0]
@@ -164,10 +166,12 @@ class TestInteractiveRemover:
         assert result is True
         assert remover.total_removed == 1
         assert remover.total_space_freed == file_info.size
-        assert not file_info.path.exists()
+        assert not sample_exists(file_info.path.name)
 
     def test_delete_file_failure(self, mock_scanner):
         """Test file deletion failure."""
+        from doppel.scanner import FileInfo
+
         remover = InteractiveRemover(mock_scanner)
 
         # Create FileInfo for nonexistent file
@@ -177,60 +181,54 @@ class TestInteractiveRemover:
             modified=0
         )
 
-        with patch('builtins.print'):
-            result = remover._delete_file(file_info)
+        result = remover._delete_file(file_info)
 
         assert result is False
         assert remover.total_removed == 0
         assert remover.total_space_freed == 0
 
-    @patch('builtins.input', return_value='1,3,5')
-    def test_get_user_choice_indices(self, mock_input, mock_scanner):
+    def test_get_user_choice_indices(self, monkeypatch, mock_scanner):
         """Test getting user choice with indices."""
+        monkeypatch.setattr("builtins.input", _input_seq("1,3,5"))
         remover = InteractiveRemover(mock_scanner)
 
-        with patch('builtins.print'):
-            choice = remover._get_user_choice(5)
+        choice = remover._get_user_choice(5)
 
         assert choice == [1, 3, 5]
 
-    @patch('builtins.input', return_value='k')
-    def test_get_user_choice_keep(self, mock_input, mock_scanner):
+    def test_get_user_choice_keep(self, monkeypatch, mock_scanner):
         """Test getting user choice to keep files."""
+        monkeypatch.setattr("builtins.input", _input_seq("k"))
         remover = InteractiveRemover(mock_scanner)
 
-        with patch('builtins.print'):
-            choice = remover._get_user_choice(3)
+        choice = remover._get_user_choice(3)
 
         assert choice == 'keep'
 
-    @patch('builtins.input', return_value='a')
-    def test_get_user_choice_auto(self, mock_input, mock_scanner):
+    def test_get_user_choice_auto(self, monkeypatch, mock_scanner):
         """Test getting user choice for auto-removal."""
+        monkeypatch.setattr("builtins.input", _input_seq("a"))
         remover = InteractiveRemover(mock_scanner)
 
-        with patch('builtins.print'):
-            choice = remover._get_user_choice(3)
+        choice = remover._get_user_choice(3)
 
         assert choice == 'auto'
 
-    @patch('builtins.input', return_value='q')
-    def test_get_user_choice_quit(self, mock_input, mock_scanner):
+    def test_get_user_choice_quit(self, monkeypatch, mock_scanner):
         """Test getting user choice to quit."""
+        monkeypatch.setattr("builtins.input", _input_seq("q"))
         remover = InteractiveRemover(mock_scanner)
 
-        with patch('builtins.print'):
-            choice = remover._get_user_choice(3)
+        choice = remover._get_user_choice(3)
 
         assert choice == 'quit'
 
-    @patch('builtins.input', side_effect=['invalid', '6', '1,2'])
-    def test_get_user_choice_invalid_input(self, mock_input, mock_scanner):
+    def test_get_user_choice_invalid_input(self, monkeypatch, mock_scanner):
         """Test handling invalid input in user choice."""
+        monkeypatch.setattr("builtins.input", _input_seq("invalid", "6", "1,2"))
         remover = InteractiveRemover(mock_scanner)
 
-        with patch('builtins.print'):
-            choice = remover._get_user_choice(3)
+        choice = remover._get_user_choice(3)
 
         # Should eventually return valid choice after invalid attempts
         assert choice == [1, 2]
@@ -244,6 +242,8 @@ class TestInteractiveRemover:
         with patch('builtins.print') as mock_print:
             remover._print_summary()
 
-        # Should print summary information
-        mock_print.assert_any_call("Files removed: 5")
-        mock_print.assert_any_call("Space freed: 1.0 MB")
\ No newline at end of file
+        # Should print summary information; one pass over the call
+        # history instead of a linear scan per assert_any_call
+        expected = {("Files removed: 5",), ("Space freed: 1.0 MB",)}
+        actual = {call.args for call in mock_print.call_args_list}
+        assert expected <= actual
\ No newline at end of file
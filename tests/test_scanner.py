@@ -2,61 +2,54 @@
 Tests for doppel.scanner module
 """
 
+import os
 import pytest
 import tempfile
-import shutil
 from pathlib import Path
-from doppel.scanner import DuplicateScanner, FileInfo
+from doppel.scanner import DuplicateScanner, FileInfo, QUICK_HASH_LIMIT
+from doppel.utils import _new_hasher
+
+def _digest(data: bytes) -> str:
+    hasher = _new_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+# Expected digests of the shared-tree contents, computed once with
+# whichever algorithm utils selected
+_EXPECTED_HASHES = {
+    content: _digest(content.encode())
+    for content in ("hello", "world", "different", "test")
+}
+
+
+@pytest.fixture(scope="module")
+def content_scan(shared_tmp_tree):
+    """Content-comparing scanner and its scan result, shared by the
+    content-comparison tests so the tree is walked and hashed once."""
+    scanner = DuplicateScanner(shared_tmp_tree, compare_content=True)
+    return scanner, scanner.scan()
 
 
 class TestDuplicateScanner:
-    """Test cases for DuplicateScanner class."""
-
-    @pytest.fixture
-    def temp_dir(self):
-        """Create temporary directory with test files."""
-        temp_dir = Path(tempfile.mkdtemp())
-
-        # Create test structure
-        # temp_dir/
-        #   ├── file1.txt (content: "hello")
-        #   ├── file2.txt (content: "world")
-        #   ├── subdir1/
-        #   │   ├── file1.txt (content: "hello")  # duplicate name, same content
-        #   │   └── file3.txt (content: "test")
-        #   └── subdir2/
-        #       ├── file1.txt (content: "different")  # duplicate name, different content
-        #       └── file2.txt (content: "world")     # duplicate name, same content
-
-        # Create files
-        (temp_dir / "file1.txt").write_text("hello")
-        (temp_dir / "file2.txt").write_text("world")
-
-        (temp_dir / "subdir1").mkdir()
-        (temp_dir / "subdir1" / "file1.txt").write_text("hello")
-        (temp_dir / "subdir1" / "file3.txt").write_text("test")
-
-        (temp_dir / "subdir2").mkdir()
-        (temp_dir / "subdir2" / "file1.txt").write_text("different")
-        (temp_dir / "subdir2" / "file2.txt").write_text("world")
-
-        yield temp_dir
-
-        # Cleanup
-        shutil.rmtree(temp_dir)
-
-    def test_scanner_initialization(self, temp_dir):
+    """Test cases for DuplicateScanner class.
+
+    Read-only tests share the session-scoped shared_tmp_tree fixture
+    from conftest.py; nothing here mutates the tree.
+    """
+
+    def test_scanner_initialization(self, shared_tmp_tree):
         """Test scanner initialization."""
-        scanner = DuplicateScanner(temp_dir)
-        assert scanner.root_path == temp_dir.resolve()
+        scanner = DuplicateScanner(shared_tmp_tree)
+        assert scanner.root_path == shared_tmp_tree.resolve()
         assert scanner.compare_content is False
 
-        scanner_with_content = DuplicateScanner(temp_dir, compare_content=True)
+        scanner_with_content = DuplicateScanner(shared_tmp_tree, compare_content=True)
         assert scanner_with_content.compare_content is True
 
-    def test_scan_finds_duplicates(self, temp_dir):
+    def test_scan_finds_duplicates(self, shared_tmp_tree):
         """Test that scan finds duplicate filenames."""
-        scanner = DuplicateScanner(temp_dir)
+        scanner = DuplicateScanner(shared_tmp_tree)
         duplicates = scanner.scan()
 
         # Should find file1.txt and file2.txt as duplicates
@@ -70,25 +63,23 @@ class TestDuplicateScanner:
         # file2.txt should have 2 copies
         assert len(duplicates["file2.txt"]) == 2
 
-    def test_scan_with_content_comparison(self, temp_dir):
+    def test_scan_with_content_comparison(self, content_scan):
         """Test scanning with content comparison enabled."""
-        scanner = DuplicateScanner(temp_dir, compare_content=True)
-        duplicates = scanner.scan()
+        scanner, duplicates = content_scan
 
         # Should still find duplicates by name
         assert "file1.txt" in duplicates
         assert "file2.txt" in duplicates
 
-        # Check that hashes are computed
-        for file_list in duplicates.values():
-            for file_info in file_list:
-                assert file_info.hash is not None
-                assert len(file_info.hash) == 32  # MD5 hash length
+        # Hashing is deferred to group_by_content; only same-size
+        # candidates are actually read and hashed
+        scanner.group_by_content(duplicates["file2.txt"])
+        for file_info in duplicates["file2.txt"]:
+            assert file_info.hash == _EXPECTED_HASHES["world"]
 
-    def test_group_by_content(self, temp_dir):
+    def test_group_by_content(self, content_scan):
         """Test grouping files by content hash."""
-        scanner = DuplicateScanner(temp_dir, compare_content=True)
-        duplicates = scanner.scan()
+        scanner, duplicates = content_scan
 
         file1_duplicates = duplicates["file1.txt"]
         content_groups = scanner.group_by_content(file1_duplicates)
@@ -101,6 +92,89 @@ class TestDuplicateScanner:
         group_sizes = [len(group) for group in content_groups.values()]
         assert sorted(group_sizes) == [1, 2]
 
+    def test_threaded_hashing_matches_serial(self, shared_tmp_tree):
+        """Test the thread-pool branch of _hash_files explicitly.
+
+        default_thread_count() can be 1 on small hosts, which would
+        leave the pool path untested; pinning threads=2 makes it run
+        deterministically, mirroring the parallel_walk smoke test.
+        """
+        scanner = DuplicateScanner(shared_tmp_tree, compare_content=True,
+                                   threads=2)
+        duplicates = scanner.scan()
+        groups = scanner.group_by_content(duplicates["file1.txt"])
+
+        # Same grouping as the serial path: the "hello" pair shares a
+        # digest, the "different" file stands alone
+        assert sorted(len(group) for group in groups.values()) == [1, 2]
+        for file_info in groups[_EXPECTED_HASHES["hello"]]:
+            assert file_info.hash == _EXPECTED_HASHES["hello"]
+
+    def test_group_by_content_head_rejection(self, tmp_path):
+        """Test that same-size files with different heads skip hashing."""
+        file_a = tmp_path / "a.bin"
+        file_b = tmp_path / "b.bin"
+        file_a.write_bytes(b"A" * 100)
+        file_b.write_bytes(b"B" * 100)
+
+        scanner = DuplicateScanner(tmp_path, compare_content=True)
+        infos = [
+            scanner._create_file_info(path, path.stat())
+            for path in (file_a, file_b)
+        ]
+        groups = scanner.group_by_content(infos)
+
+        # Same size but different first block: each file gets its own
+        # synthetic head group and is never fully hashed
+        assert len(groups) == 2
+        assert all(key.startswith("head:") for key in groups)
+        assert all(info.hash is None for info in infos)
+
+    def test_group_by_content_two_file_fast_path(self, tmp_path):
+        """Test the different-size two-file short-circuit."""
+        file_a = tmp_path / "a.bin"
+        file_b = tmp_path / "b.bin"
+        file_a.write_bytes(b"short")
+        file_b.write_bytes(b"noticeably longer content")
+
+        scanner = DuplicateScanner(tmp_path, compare_content=True)
+        info_a = scanner._create_file_info(file_a, file_a.stat())
+        info_b = scanner._create_file_info(file_b, file_b.stat())
+
+        groups = scanner.group_by_content([info_a, info_b])
+
+        assert groups == {
+            f"size:{info_a.size}": [info_a],
+            f"size:{info_b.size}": [info_b],
+        }
+        assert info_a.hash is None and info_b.hash is None
+
+    def test_quick_mode_uses_partial_hash(self, tmp_path):
+        """Test that quick=True hashes only the head and tail."""
+        limit = QUICK_HASH_LIMIT
+        head = os.urandom(limit)
+        tail = os.urandom(limit)
+        paths = []
+        for name, middle in (("a.bin", b"\x00"), ("b.bin", b"\xff")):
+            path = tmp_path / name
+            path.write_bytes(head + middle * limit + tail)
+            paths.append(path)
+
+        def file_infos(scanner):
+            return [
+                scanner._create_file_info(path, path.stat())
+                for path in paths
+            ]
+
+        # Identical head, tail and size: quick mode cannot distinguish
+        # the files (the documented trade-off), so both land in one
+        # group; a full-content scanner still separates them
+        quick = DuplicateScanner(tmp_path, compare_content=True, quick=True)
+        assert len(quick.group_by_content(file_infos(quick))) == 1
+
+        full = DuplicateScanner(tmp_path, compare_content=True)
+        assert len(full.group_by_content(file_infos(full))) == 2
+
     def test_nonexistent_directory(self):
         """Test scanner with nonexistent directory."""
         scanner = DuplicateScanner(Path("/nonexistent/path"))
@@ -108,9 +182,9 @@ class TestDuplicateScanner:
         with pytest.raises(FileNotFoundError):
             scanner.scan()
 
-    def test_file_instead_of_directory(self, temp_dir):
+    def test_file_instead_of_directory(self, shared_tmp_tree):
         """Test scanner with file path instead of directory."""
-        file_path = temp_dir / "file1.txt"
+        file_path = shared_tmp_tree / "file1.txt"
         scanner = DuplicateScanner(file_path)
 
         with pytest.raises(NotADirectoryError):
@@ -130,24 +204,55 @@ class TestDuplicateScanner:
             temp_path = Path(temp_dir)
 
             # Create files with unique names
-            (temp_path / "unique1.txt").write_text("content1")
-            (temp_path / "unique2.txt").write_text("content2")
-            (temp_path / "unique3.txt").write_text("content3")
+            (temp_path / "unique1.txt").write_bytes(b"content1")
+            (temp_path / "unique2.txt").write_bytes(b"content2")
+            (temp_path / "unique3.txt").write_bytes(b"content3")
 
             scanner = DuplicateScanner(temp_path)
             duplicates = scanner.scan()
 
             assert len(duplicates) == 0
 
+    def test_parallel_walk_matches_serial(self, shared_tmp_tree):
+        """Test that the parallel walker finds the same duplicates."""
+        serial = DuplicateScanner(shared_tmp_tree).scan()
+        parallel = DuplicateScanner(shared_tmp_tree, parallel_walk=True).scan()
+
+        # The parallel walk discovers files in no particular order, so
+        # compare each group as a set of paths rather than a list
+        assert set(parallel) == set(serial)
+        for filename, file_list in serial.items():
+            assert {f.path for f in parallel[filename]} == \
+                {f.path for f in file_list}
+
+    def test_display_duplicates_streaming(self, shared_tmp_tree, capsys):
+        """Test display_duplicates fed from the scan_iter stream."""
+        scanner = DuplicateScanner(shared_tmp_tree)
+        scanner.display_duplicates(scanner.scan_iter())
+
+        output = capsys.readouterr().out
+        assert "Duplicate filenames:" in output
+        assert "file1.txt" in output
+        assert "file2.txt" in output
+        assert "Found 2 sets of duplicate filenames (5 total files)." in output
+
+    def test_display_duplicates_streaming_empty(self, capsys):
+        """Test the streamed no-duplicates message."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            scanner = DuplicateScanner(Path(temp_dir))
+            scanner.display_duplicates(scanner.scan_iter())
+
+        assert "No duplicate filenames found!" in capsys.readouterr().out
+
     def test_case_insensitive_detection(self):
         """Test that duplicate detection is case-insensitive."""
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
 
             # Create files with same name but different cases
-            (temp_path / "File.txt").write_text("content1")
-            (temp_path / "file.txt").write_text("content2")
-            (temp_path / "FILE.TXT").write_text("content3")
+            (temp_path / "File.txt").write_bytes(b"content1")
+            (temp_path / "file.txt").write_bytes(b"content2")
+            (temp_path / "FILE.TXT").write_bytes(b"content3")
 
             scanner = DuplicateScanner(temp_path)
             duplicates = scanner.scan()
@@ -166,7 +271,7 @@ class TestFileInfo:
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
             test_file = temp_path / "test.txt"
-            test_file.write_text("test content")
+            test_file.write_bytes(b"test content")
 
             stat = test_file.stat()
             file_info = FileInfo(
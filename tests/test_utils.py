@@ -2,107 +2,217 @@
 Tests for doppel.utils module
 """
 
+import importlib.util
+import io
+import os
+import re
+
 import pytest
-import tempfile
+from hypothesis import given, strategies as st
 from pathlib import Path
-from unittest.mock import patch
 from doppel.utils import (
     get_file_hash,
     format_size,
     safe_path_str,
     confirm_action,
-    parse_indices
+    parse_indices,
+    _hasher_factory,
+    _new_hasher
 )
 
+# Length of a hex digest from whichever algorithm utils selected
+HASH_HEX_LENGTH = len(_new_hasher().hexdigest())
 
-class TestGetFileHash:
-    """Test cases for get_file_hash function."""
+# Algorithms the hash tests run against: the auto-selected default plus
+# explicit names accepted for interoperability
+# A digest is lowercase hex of the algorithm's length; tighter than
+# isalnum, which accepts any Unicode letter
+_HEX_RE = re.compile(r"[0-9a-f]+")
 
-    def test_hash_calculation(self):
-        """Test MD5 hash calculation for a file."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            f.write("test content")
-            temp_path = Path(f.name)
+_ALGORITHMS = [
+    pytest.param(None, id="default"),
+    pytest.param("md5", id="md5"),
+    pytest.param("blake2b", id="blake2b"),
+    pytest.param("blake3", id="blake3", marks=pytest.mark.skipif(
+        importlib.util.find_spec("blake3") is None,
+        reason="blake3 not installed")),
+]
 
-        try:
-            hash_result = get_file_hash(temp_path)
 
-            # MD5 hash should be 32 characters
-            assert len(hash_result) == 32
-            assert hash_result.isalnum()
+@pytest.fixture(scope="module")
+def hash_of(canonical_files):
+    """Memoized default-algorithm hash of a canonical file by label.
 
-            # Same content should produce same hash
-            hash_result2 = get_file_hash(temp_path)
-            assert hash_result == hash_result2
-        finally:
-            temp_path.unlink()
+    get_file_hash is pure for unchanged files, so repeated assertions
+    against the same canonical content reuse one computation.
+    """
+    cache = {}
 
-    def test_hash_different_content(self):
-        """Test that different content produces different hashes."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f1:
-            f1.write("content1")
-            temp_path1 = Path(f1.name)
+    def _get(label):
+        if label not in cache:
+            cache[label] = get_file_hash(canonical_files[label])
+        return cache[label]
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f2:
-            f2.write("content2")
-            temp_path2 = Path(f2.name)
+    return _get
 
-        try:
-            hash1 = get_file_hash(temp_path1)
-            hash2 = get_file_hash(temp_path2)
 
-            assert hash1 != hash2
-        finally:
-            temp_path1.unlink()
-            temp_path2.unlink()
+class TestGetFileHash:
+    """Test cases for get_file_hash function."""
 
-    def test_hash_nonexistent_file(self):
-        """Test hash calculation for nonexistent file."""
-        hash_result = get_file_hash(Path("/nonexistent/file.txt"))
-        assert hash_result == ""
+    @pytest.mark.parametrize("algorithm", _ALGORITHMS)
+    def test_hash_calculation(self, algorithm, canonical_files, hash_of):
+        """Test content hash calculation for a file."""
+        temp_path = canonical_files["test-content"]
 
-    def test_hash_empty_file(self):
-        """Test hash calculation for empty file."""
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            temp_path = Path(f.name)
+        hash_result = get_file_hash(temp_path, algorithm=algorithm)
 
-        try:
-            hash_result = get_file_hash(temp_path)
+        expected_length = len(_hasher_factory(algorithm)().hexdigest())
+        assert len(hash_result) == expected_length
+        assert _HEX_RE.fullmatch(hash_result)
 
-            # MD5 of empty file is d41d8cd98f00b204e9800998ecf8427e
-            assert hash_result == "d41d8cd98f00b204e9800998ecf8427e"
-        finally:
-            temp_path.unlink()
+        # Same content should produce same hash (memoized for default)
+        if algorithm is None:
+            assert hash_result == hash_of("test-content")
+        else:
+            assert hash_result == get_file_hash(temp_path, algorithm=algorithm)
 
+    def test_hash_unknown_algorithm(self):
+        """Test that an unavailable algorithm raises ValueError."""
+        with pytest.raises(ValueError):
+            get_file_hash(Path("irrelevant.txt"), algorithm="not-a-hash")
 
-class TestFormatSize:
-    """Test cases for format_size function."""
+    def test_hash_different_content(self, hash_of):
+        """Test that different content produces different hashes."""
+        assert hash_of("content1") != hash_of("content2")
+
+        # Memoized lookups return the same digest, not a recomputation
+        assert hash_of("content1") == hash_of("content1")
+
+    def test_hash_large_file(self, tmp_path):
+        """Test hashing a file large enough for the mmap path."""
+        data = os.urandom(1 << 20) * 8  # 8 MiB, well past _MMAP_THRESHOLD
+        temp_path = tmp_path / "large.bin"
+        temp_path.write_bytes(data)
+
+        expected = _new_hasher()
+        expected.update(data)
+
+        assert get_file_hash(temp_path) == expected.hexdigest()
+
+    def test_hash_large_file_streaming_fallback(self, tmp_path, monkeypatch):
+        """Test the fadvise-hinted streaming path taken when mmap fails."""
+        data = os.urandom(1 << 20) * 10  # 10 MiB
+        temp_path = tmp_path / "stream.bin"
+        temp_path.write_bytes(data)
+
+        monkeypatch.setattr("doppel.utils._hash_mmap",
+                            lambda f, new_hasher=None: None)
+
+        expected = _new_hasher()
+        expected.update(data)
+
+        assert get_file_hash(temp_path) == expected.hexdigest()
+
+    def test_hash_limit_head_tail(self, tmp_path):
+        """Test the partial head+tail hash taken when limit is set."""
+        limit = 1 << 16
+        head = os.urandom(limit)
+        tail = os.urandom(limit)
+        file_a = tmp_path / "a.bin"
+        file_b = tmp_path / "b.bin"
+        file_a.write_bytes(head + b"\x00" * limit + tail)
+        file_b.write_bytes(head + b"\xff" * limit + tail)
+
+        # Same head, tail and size: the partial hash cannot tell the
+        # files apart — that is the documented trade-off — while the
+        # full hash still can
+        assert get_file_hash(file_a, limit=limit) == \
+            get_file_hash(file_b, limit=limit)
+        assert get_file_hash(file_a) != get_file_hash(file_b)
+
+    def test_hash_limit_small_file_reads_everything(self, tmp_path):
+        """Test that limit is a no-op for files under 2*limit bytes."""
+        temp_path = tmp_path / "small.bin"
+        temp_path.write_bytes(b"well under the limit")
+
+        assert get_file_hash(temp_path, limit=1 << 16) == \
+            get_file_hash(temp_path)
+
+    def test_hash_cached_on_repeat_call(self, tmp_path, monkeypatch):
+        """Test that an unchanged file is not rehashed on repeat calls."""
+        temp_path = tmp_path / "memo.txt"
+        temp_path.write_bytes(b"memo content")
+        first = get_file_hash(temp_path)
+
+        def fail_compute(*args, **kwargs):
+            raise AssertionError("unchanged file was rehashed")
+
+        monkeypatch.setattr("doppel.utils._compute_hash", fail_compute)
+        assert get_file_hash(temp_path) == first
+        monkeypatch.undo()
+
+        # Changing the file invalidates the memo entry
+        temp_path.write_bytes(b"different memo content")
+        assert get_file_hash(temp_path) != first
+
+    @pytest.fixture
+    def never_exists(self, tmp_path):
+        """A path guaranteed absent; a hardcoded /nonexistent path can
+        hit PermissionError rather than FileNotFoundError on locked-
+        down CI runners."""
+        return tmp_path / "nonexistent.txt"
+
+    def test_hash_nonexistent_file(self, never_exists):
+        """Test hash calculation for nonexistent file."""
+        hash_result = get_file_hash(never_exists)
+        assert hash_result == ""
 
-    def test_bytes_formatting(self):
-        """Test formatting of sizes in bytes."""
-        assert format_size(0) == "0 B"
-        assert format_size(512) == "512.0 B"
-        assert format_size(1023) == "1023.0 B"
+    @pytest.mark.parametrize("algorithm", _ALGORITHMS)
+    def test_hash_empty_file(self, algorithm, canonical_files):
+        """Test hash calculation for empty file."""
+        hash_result = get_file_hash(canonical_files["empty"], algorithm=algorithm)
 
-    def test_kilobytes_formatting(self):
-        """Test formatting of sizes in kilobytes."""
-        assert format_size(1024) == "1.0 KB"
-        assert format_size(1536) == "1.5 KB"
-        assert format_size(1024 * 1023) == "1023.0 KB"
+        # Digest of empty input for the algorithm in use
+        assert hash_result == _hasher_factory(algorithm)().hexdigest()
 
-    def test_megabytes_formatting(self):
-        """Test formatting of sizes in megabytes."""
-        assert format_size(1024 * 1024) == "1.0 MB"
-        assert format_size(1024 * 1024 * 2.5) == "2.5 MB"
 
-    def test_gigabytes_formatting(self):
-        """Test formatting of sizes in gigabytes."""
-        assert format_size(1024 * 1024 * 1024) == "1.0 GB"
-        assert format_size(1024 * 1024 * 1024 * 1.5) == "1.5 GB"
+class TestFormatSize:
+    """Test cases for format_size function."""
 
-    def test_terabytes_formatting(self):
-        """Test formatting of sizes in terabytes."""
-        assert format_size(1024 * 1024 * 1024 * 1024) == "1.0 TB"
+    @pytest.mark.parametrize("size_bytes,expected", [
+        (0, "0 B"),
+        (512, "512.0 B"),
+        (1023, "1023.0 B"),
+        (1024, "1.0 KB"),
+        (1536, "1.5 KB"),
+        (1024 * 1023, "1023.0 KB"),
+        (1024 * 1024, "1.0 MB"),
+        (1024 * 1024 * 2.5, "2.5 MB"),
+        (1024 * 1024 * 1024, "1.0 GB"),
+        (1024 * 1024 * 1024 * 1.5, "1.5 GB"),
+        (1024 * 1024 * 1024 * 1024, "1.0 TB"),
+        (1024 ** 5, "1024.0 TB"),  # TB is the top tier; no rollover
+    ])
+    def test_format_size(self, size_bytes, expected):
+        """Test formatting across the unit table."""
+        assert format_size(size_bytes) == expected
+
+    @given(st.integers(min_value=0, max_value=2 ** 50))
+    def test_format_size_properties(self, size_bytes):
+        """Property test: hundreds of sizes checked in one test node."""
+        result = format_size(size_bytes)
+
+        if size_bytes == 0:
+            assert result == "0 B"
+            return
+
+        value_str, unit = result.split()
+        assert unit in ("B", "KB", "MB", "GB", "TB")
+
+        # The printed value times its unit factor recovers the input
+        # within one-decimal rounding
+        factor = 1024 ** ("B", "KB", "MB", "GB", "TB").index(unit)
+        assert abs(float(value_str) * factor - size_bytes) <= 0.06 * factor
 
 
 class TestSafePathStr:
@@ -134,79 +244,67 @@ class TestSafePathStr:
 class TestConfirmAction:
     """Test cases for confirm_action function."""
 
-    @patch('builtins.input', return_value='y')
-    def test_confirm_yes(self, mock_input):
-        """Test confirmation with 'y' response."""
-        result = confirm_action("Continue?")
-        assert result is True
-
-    @patch('builtins.input', return_value='n')
-    def test_confirm_no(self, mock_input):
-        """Test confirmation with 'n' response."""
-        result = confirm_action("Continue?")
-        assert result is False
-
-    @patch('builtins.input', return_value='')
-    def test_confirm_default_false(self, mock_input):
-        """Test confirmation with default False."""
-        result = confirm_action("Continue?", default=False)
-        assert result is False
-
-    @patch('builtins.input', return_value='')
-    def test_confirm_default_true(self, mock_input):
-        """Test confirmation with default True."""
-        result = confirm_action("Continue?", default=True)
-        assert result is True
-
-    @patch('builtins.input', return_value='yes')
-    def test_confirm_yes_variations(self, mock_input):
-        """Test confirmation with various 'yes' responses."""
-        result = confirm_action("Continue?")
-        assert result is True
+    @pytest.fixture
+    def stdin(self, monkeypatch):
+        """Feed input() from an in-memory buffer.
+
+        Swapping sys.stdin skips the mock library entirely; input()
+        just reads lines from the StringIO.
+        """
+        buffer = io.StringIO()
+        monkeypatch.setattr("sys.stdin", buffer)
+        return buffer
+
+    @pytest.mark.parametrize("response,default,expected", [
+        ("y", False, True),
+        ("yes", False, True),
+        ("n", False, False),
+        ("", False, False),
+        ("", True, True),
+    ], ids=["yes", "yes-word", "no", "default-false", "default-true"])
+    def test_confirm(self, stdin, response, default, expected):
+        """Test confirmation across responses and defaults."""
+        stdin.write(response + "\n")
+        stdin.seek(0)
+
+        assert confirm_action("Continue?", default=default) is expected
+
+
+# Expected parse_indices error shapes, compiled once; pytest.raises
+# passes these straight to re.search
+_ERR_OUT_OF_RANGE = re.compile(r"Index \d+ out of range")
+_ERR_NOT_A_NUMBER = re.compile(r"'.+' is not a valid number")
 
 
 class TestParseIndices:
     """Test cases for parse_indices function."""
 
-    def test_single_index(self):
-        """Test parsing single index."""
-        result = parse_indices("3", max_index=5)
-        assert result == [3]
-
-    def test_multiple_indices(self):
-        """Test parsing multiple indices."""
-        result = parse_indices("1,3,5", max_index=5)
-        assert result == [1, 3, 5]
-
-    def test_indices_with_spaces(self):
-        """Test parsing indices with spaces."""
-        result = parse_indices(" 1 , 3 , 5 ", max_index=5)
-        assert result == [1, 3, 5]
-
-    def test_duplicate_indices(self):
-        """Test that duplicate indices are removed."""
-        result = parse_indices("1,3,1,5", max_index=5)
-        assert result == [1, 3, 5]
-
-    def test_out_of_range_index(self):
-        """Test that out of range indices raise ValueError."""
-        with pytest.raises(ValueError, match="Index 6 out of range"):
-            parse_indices("1,6", max_index=5)
-
-    def test_invalid_number(self):
-        """Test that invalid numbers raise ValueError."""
-        with pytest.raises(ValueError, match="'abc' is not a valid number"):
-            parse_indices("1,abc,3", max_index=5)
-
-    def test_empty_input(self):
-        """Test that empty input returns empty list."""
-        result = parse_indices("", max_index=5)
-        assert result == []
-
-        result = parse_indices("   ", max_index=5)
-        assert result == []
-
-    def test_zero_index(self):
-        """Test that zero index raises ValueError."""
-        with pytest.raises(ValueError, match="Index 0 out of range"):
-            parse_indices("0,1,2", max_index=5)
\ No newline at end of file
+    @pytest.mark.parametrize("input_str,expected", [
+        ("3", [3]),
+        ("1,3,5", [1, 3, 5]),
+        (" 1 , 3 , 5 ", [1, 3, 5]),
+        ("1,3,1,5", [1, 3, 5]),
+        ("", []),
+        ("   ", []),
+    ], ids=["single", "multiple", "spaces", "duplicates", "empty", "blank"])
+    def test_valid_input(self, input_str, expected):
+        """Test parsing of well-formed index strings."""
+        assert parse_indices(input_str, max_index=5) == expected
+
+    def test_large_input(self):
+        """Test the bulk fast path on a selection of 100k indices."""
+        count = 100_000
+        input_str = ",".join(map(str, range(1, count + 1)))
+
+        assert parse_indices(input_str, max_index=count) == \
+            list(range(1, count + 1))
+
+    @pytest.mark.parametrize("input_str,pattern", [
+        ("1,6", _ERR_OUT_OF_RANGE),
+        ("0,1,2", _ERR_OUT_OF_RANGE),
+        ("1,abc,3", _ERR_NOT_A_NUMBER),
+    ], ids=["out-of-range", "zero", "not-a-number"])
+    def test_invalid_input(self, input_str, pattern):
+        """Test that malformed index strings raise ValueError."""
+        with pytest.raises(ValueError, match=pattern):
+            parse_indices(input_str, max_index=5)
\ No newline at end of file